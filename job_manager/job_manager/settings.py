@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/1.9/ref/settings/
 
 import os, sys
 import json
+import logging
 
 ENV = os.environ.get('NMPI_ENV', 'production')
 LOCAL_DB = False    # only applies when ENV='dev'
@@ -42,6 +43,7 @@ INSTALLED_APPS = [
     'django.contrib.contenttypes',
     'django.contrib.sessions',
     'django.contrib.messages',
+    'django.contrib.postgres',
     'django.contrib.staticfiles',
     'job_manager',
     'simqueue',
@@ -102,12 +104,15 @@ if ENV in ('dev', 'travis') and LOCAL_DB:
 else:
     DATABASES = {
         'default': {
-            'ENGINE': 'django.db.backends.postgresql_psycopg2',
+            'ENGINE': 'django.db.backends.postgresql',
             'NAME': 'nmpi',
             'USER': 'nmpi_dbadmin',
             'PASSWORD': os.environ.get("NMPI_DATABASE_PASSWORD"),
             'HOST': os.environ.get("NMPI_DATABASE_HOST"),
             'PORT': os.environ.get("NMPI_DATABASE_PORT", "5432"),
+            # keep connections open between requests so we don't pay
+            # TCP + TLS + auth setup on every request
+            'CONN_MAX_AGE': 300,
         },
     }
 
@@ -230,6 +235,21 @@ LOGGING = {
 if ENV in ('dev', 'travis'):
     LOGGING['handlers']['file']['filename'] = 'django.log'
 
+# In development, flag potential N+1 query patterns in the ORM.
+# nplusone logs "Potential n+1 query detected on <model>.<field>" with
+# the offending location; fix hits by adding select_related /
+# prefetch_related on the resource queryset concerned.
+if DEBUG:
+    INSTALLED_APPS.append('nplusone.ext.django')
+    MIDDLEWARE_CLASSES.insert(0, 'nplusone.ext.django.NPlusOneMiddleware')
+    # nplusone emits its messages at NPLUSONE_LOG_LEVEL (default DEBUG),
+    # so this must match the logger level below or nothing gets through
+    NPLUSONE_LOG_LEVEL = logging.WARNING
+    LOGGING['loggers']['nplusone'] = {
+        'handlers': ['file'],
+        'level': 'WARNING',
+    }
+
 if os.path.exists(os.path.join(BASE_DIR, "build_info.json")):
     with open(os.path.join(BASE_DIR, "build_info.json"), "r") as fp:
         BUILD_INFO = json.load(fp)
@@ -52,4 +52,5 @@ urlpatterns = (
     url(r'^api/', include(api.urls)),
     url(r'^copydata/(?P<target>\w+)/(?P<job_id>\d+)/(?:path-(?P<path>\w+)/)?$', views.copy_datafiles_to_storage, name="copydata"),
     url(r'^dashboard/', TemplateView.as_view(template_name='dashboard.html')),
+    url(r'^health/$', views.health, name="health"),
 )
\ No newline at end of file
@@ -2,12 +2,68 @@
 
 """
 
+import hashlib
 import logging
 from django.conf import settings
 import requests
+from cachetools import TTLCache
 
 logger = logging.getLogger("quotas")
 
+# a shared session reuses TCP/TLS connections to the EBRAINS services
+# across requests, rather than paying a new handshake per call
+ebrains_session = requests.Session()
+
+# identity and collab lookups change rarely, so cache them for a short
+# period. Cache keys use a hash of the access token, rather than the
+# token itself, so that tokens are not kept in memory.
+collab_info_cache = TTLCache(maxsize=10000, ttl=60)
+userinfo_cache = TTLCache(maxsize=10000, ttl=60)
+
+
+def _token_hash(auth):
+    return hashlib.blake2s((auth or "").encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _collab_info_cache_key(collab_id, auth):
+    return (collab_id, _token_hash(auth))
+
+
+def get_userinfo(request):
+    """
+    Retrieve EBRAINS user information for the access token in `request`.
+
+    A single request may instantiate several CollabServices (e.g. the
+    admin check plus a collab permission check), so the response is
+    memoized on the request object. It is also cached across requests
+    for a short period, keyed by a hash of the token, so active clients
+    do not hit the identity service on every request.
+    Returns None if there is no token or the query fails.
+    """
+    userinfo = getattr(request, "_ebrains_userinfo", None)
+    if userinfo is not None:
+        return userinfo
+    auth = request.META.get("HTTP_AUTHORIZATION", None)
+    if auth is None:
+        return None
+    cache_key = _token_hash(auth)
+    userinfo = userinfo_cache.get(cache_key)
+    if userinfo is not None:
+        request._ebrains_userinfo = userinfo
+        return userinfo
+    url = f"{settings.HBP_IDENTITY_SERVICE_URL}/userinfo"
+    headers = {'Authorization': auth}
+    logger.debug("Requesting EBRAINS user information for given access token")
+    res = ebrains_session.get(url, headers=headers)
+    if res.status_code != 200:
+        logger.warning("Error requesting {} with headers {}".format(url, headers))
+        return None
+    logger.debug("User information retrieved")
+    userinfo = res.json()
+    request._ebrains_userinfo = userinfo
+    userinfo_cache[cache_key] = userinfo
+    return userinfo
+
 
 def is_admin(request):
     # v2
@@ -34,20 +90,10 @@ class CollabService(object):
 
     @classmethod
     def _get_permissions(cls, request, collab_id, check_public):
-        url = f"{settings.HBP_IDENTITY_SERVICE_URL}/userinfo"
-        auth = request.META.get("HTTP_AUTHORIZATION", None)
-        if auth is None:
-            return {"VIEW": False, "UPDATE": False}
-        headers = {'Authorization': auth}
-        logger.debug("Requesting EBRAINS user information for given access token")
-        res = requests.get(url, headers=headers)
-        if res.status_code != 200:
-            logger.warning("Error requesting {} with headers {}".format(url, headers))
+        userinfo = get_userinfo(request)
+        if userinfo is None:
             return {"VIEW": False, "UPDATE": False}
 
-        logger.debug("User information retrieved")
-        userinfo = res.json()
-
         target_team_names = {role: f"collab-{collab_id}-{role}"
                              for role in ("viewer", "editor", "administrator")}
 
@@ -73,10 +119,15 @@ class CollabService(object):
 
     @classmethod
     def get_collab_info(cls, request, collab_id):
+        auth = request.META.get("HTTP_AUTHORIZATION")
+        cache_key = _collab_info_cache_key(collab_id, auth)
+        cached_response = collab_info_cache.get(cache_key)
+        if cached_response is not None:
+            return cached_response
         collab_info_url = f"{settings.HBP_COLLAB_SERVICE_URL}collabs/{collab_id}"
-        headers = {'Authorization': request.META.get("HTTP_AUTHORIZATION")}
+        headers = {'Authorization': auth}
         try:
-            res = requests.get(collab_info_url, headers=headers, timeout=5)
+            res = ebrains_session.get(collab_info_url, headers=headers, timeout=5)
         except requests.exceptions.ConnectionError as err:
             response = {
                 "error": {
@@ -95,6 +146,7 @@ class CollabService(object):
                 }
             else:
                 response = res.json()
+                collab_info_cache[cache_key] = response  # only cache successful lookups
         return response
 
     @property
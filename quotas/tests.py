@@ -549,4 +549,48 @@ class QuotaResourceTest(TestCase):
         self.assertEqual(response.status_code, 403)
         self.assertEqual(response.json()["error"], "You do not have permission to add a quota to a project.")
 
+    def test_post_quota_list_as_admin(self):
+        """Admins can create several quotas in a single request."""
+        project_id = self.test_projects["Alice's public project"].context
+        new_quota_data = [dict(project=project_id,
+                               limit=100000.0,
+                               units="core-hours",
+                               usage=0.0,
+                               platform="SpiNNaker"),
+                          dict(project=project_id,
+                               limit=2000.0,
+                               units="wafer-hours",
+                               usage=0.0,
+                               platform="BrainScaleS-2")]
+        n_before = Quota.objects.count()
+        response = self.admin.post('/projects/{}/quotas/'.format(project_id),
+                                   data=json.dumps(new_quota_data),
+                                   content_type="application/json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Quota.objects.count(), n_before + len(new_quota_data))
+        retrieved = response.json()
+        self.assertIsInstance(retrieved, list)
+        self.assertEqual(len(retrieved), len(new_quota_data))
+        for expected, actual in zip(new_quota_data, retrieved):
+            for key in ("limit", "units", "usage", "platform", "project"):
+                self.assertEqual(expected[key], actual[key])
+
+    def test_post_quota_list_with_invalid_entry(self):
+        """If any quota in the list is invalid, none of them are created."""
+        project_id = self.test_projects["Alice's public project"].context
+        new_quota_data = [dict(project=project_id,
+                               limit=100000.0,
+                               units="core-hours",
+                               usage=0.0,
+                               platform="SpiNNaker"),
+                          dict(project=project_id,  # missing limit and usage
+                               units="wafer-hours",
+                               platform="BrainScaleS-2")]
+        n_before = Quota.objects.count()
+        response = self.admin.post('/projects/{}/quotas/'.format(project_id),
+                                   data=json.dumps(new_quota_data),
+                                   content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Quota.objects.count(), n_before)
+
 #     #def test_update_usage(self):
@@ -184,11 +184,16 @@ class ProjectResource(BaseResource):
                     data[field] = value
             form = ProposalForm(data, instance=project)
             if form.is_valid():
-                project = form.save()
+                # write only the columns the client actually changed,
+                # rather than rewriting the full row on every edit
+                project = form.save(commit=False)
+                update_fields = [name for name in form.changed_data
+                                 if name in form._meta.fields]
                 if form.cleaned_data.get("submitted", False):
                     project.submission_date = date.today()
-                    project.save()
+                    update_fields.append("submission_date")
                     #notify_coordinators(request, project)
+                project.save(update_fields=update_fields)
                 return HttpResponse('', status=200)  # should be 204 No Content ?
             else:
                 return HttpResponseBadRequest(form.errors.as_json(),
@@ -250,7 +255,9 @@ class ProjectListResource(BaseResource):
                     filters["accepted"] = True  # non-members only see accepted projects.
             else:
                 return json_err(HttpResponseForbidden, "You must specify a collab id.")
-        projects = Project.objects.filter(**filters)
+        # the serializer renders each project's quotas, so batch them into
+        # a single query rather than one per project
+        projects = Project.objects.filter(**filters).prefetch_related("quota_set")
         content = self.serializer.serialize(projects)
         return HttpResponse(content, content_type="application/json; charset=utf-8", status=200)
 
@@ -318,10 +325,23 @@ class QuotaListResource(BaseResource):
     serializer = QuotaSerializer
 
     def post(self, request, *args, **kwargs):
-         """Add a quota to a project"""
+         """Add a quota, or a list of quotas, to a project"""
          if not is_admin(request):
              return json_err(HttpResponseForbidden, "You do not have permission to add a quota to a project.")
-         form = AddQuotaForm(json.loads(request.body))
+         data = json.loads(request.body)
+         if isinstance(data, list):
+             # typical project setup submits several quotas at once;
+             # validate them all, then insert them with a single query
+             forms = [AddQuotaForm(item) for item in data]
+             invalid_forms = [form for form in forms if not form.is_valid()]
+             if invalid_forms:
+                 content = "[{}]".format(", ".join(form.errors.as_json() for form in invalid_forms))
+                 return HttpResponseBadRequest(content,
+                                               content_type="application/json; charset=utf-8")
+             quotas = Quota.objects.bulk_create([form.save(commit=False) for form in forms])
+             content = self.serializer.serialize(quotas)
+             return HttpResponse(content, content_type="application/json; charset=utf-8", status=201)
+         form = AddQuotaForm(data)
          if form.is_valid():
              quota = form.save()
              content = self.serializer.serialize(quota)
@@ -86,12 +86,15 @@ if ENV == "dev" and LOCAL_DB:
 else:
     DATABASES = {
         'default': {
-            'ENGINE': 'django.db.backends.postgresql_psycopg2',
+            'ENGINE': 'django.db.backends.postgresql',
             'NAME': 'nmpi',
             'USER': 'nmpi_dbadmin',
             'PASSWORD': os.environ.get("NMPI_DATABASE_PASSWORD"),
             'HOST': os.environ.get("NMPI_DATABASE_HOST"),
             'PORT': os.environ.get("NMPI_DATABASE_PORT", "5432"),
+            # keep connections open between requests so we don't pay
+            # TCP + TLS + auth setup on every request
+            'CONN_MAX_AGE': 300,
         },
     }
 
@@ -16,7 +16,10 @@ Including another URLconf
 from django.conf.urls import include, url
 from django.contrib import admin
 
+from . import views
+
 urlpatterns = [
     url(r'^admin/', include(admin.site.urls)),
+    url(r'^health/$', views.health, name="health"),
     url(r'^', include('quotas.urls')),
 ]
@@ -0,0 +1,11 @@
+import json
+from django.db import connection
+from django.http import HttpResponse
+
+
+def health(request):
+    """Check that the app is up and can reach the database."""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+        cursor.fetchone()
+    return HttpResponse(json.dumps({"status": "ok"}), content_type="application/json")
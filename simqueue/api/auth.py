@@ -1,28 +1,73 @@
 
+import hashlib
 import logging
 from tastypie.authorization import Authorization
 from tastypie.authentication import Authentication, ApiKeyAuthentication
 from tastypie.exceptions import NotFound
 from django.conf import settings
 import requests
+from cachetools import TTLCache
 
 
 logger = logging.getLogger("simqueue")
 
+# a shared session reuses TCP/TLS connections to the EBRAINS services
+# across requests, rather than paying a new handshake per call
+ebrains_session = requests.Session()
+
+# identity and collab lookups change rarely, so cache them for a short
+# period. Cache keys use a hash of the access token, rather than the
+# token itself, so that tokens are not kept in memory.
+collab_info_cache = TTLCache(maxsize=10000, ttl=60)
+userinfo_cache = TTLCache(maxsize=10000, ttl=60)
+
+
+def _token_hash(auth):
+    return hashlib.blake2s((auth or "").encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _collab_info_cache_key(collab_id, auth):
+    return (collab_id, _token_hash(auth))
+
+
+def get_userinfo(request):
+    """
+    Retrieve EBRAINS user information for the access token in `request`.
+
+    Authentication and authorization each need this, often several times
+    while handling a single request, so the response is memoized on the
+    request object. It is also cached across requests for a short period,
+    keyed by a hash of the token, so clients polling the API do not hit
+    the identity service on every request.
+    """
+    userinfo = getattr(request, "_ebrains_userinfo", None)
+    if userinfo is not None:
+        return userinfo
+    auth = request.META["HTTP_AUTHORIZATION"]
+    cache_key = _token_hash(auth)
+    userinfo = userinfo_cache.get(cache_key)
+    if userinfo is not None:
+        request._ebrains_userinfo = userinfo
+        return userinfo
+    url = f"{settings.HBP_IDENTITY_SERVICE_URL_V2}/userinfo"
+    headers = {'Authorization': auth}
+    logger.debug("Requesting EBRAINS user information for given access token")
+    res = ebrains_session.get(url, headers=headers)
+    if res.status_code != 200:
+        logger.debug("Error requesting {} with headers {}".format(url, headers))
+        raise Exception(res.content)
+    logger.debug("User information retrieved")
+    userinfo = res.json()
+    request._ebrains_userinfo = userinfo
+    userinfo_cache[cache_key] = userinfo
+    return userinfo
+
 
 class CollabService(object):
 
     @classmethod
     def _get_permissions(cls, request, collab_id, check_public=True):
-        url = f"{settings.HBP_IDENTITY_SERVICE_URL_V2}/userinfo"
-        headers = {'Authorization': request.META["HTTP_AUTHORIZATION"]}
-        logger.debug("Requesting EBRAINS user information for given access token")
-        res = requests.get(url, headers=headers)
-        if res.status_code != 200:
-            logger.debug("Error requesting {} with headers {}".format(url, headers))
-            raise Exception(res.content)
-        logger.debug("User information retrieved")
-        userinfo = res.json()
+        userinfo = get_userinfo(request)
 
         target_team_names = {role: f"collab-{collab_id}-{role}"
                             for role in ("viewer", "editor", "administrator")}
@@ -48,10 +93,15 @@ class CollabService(object):
 
     @classmethod
     def get_collab_info(cls, request, collab_id):
+        auth = request.META["HTTP_AUTHORIZATION"]
+        cache_key = _collab_info_cache_key(collab_id, auth)
+        cached_response = collab_info_cache.get(cache_key)
+        if cached_response is not None:
+            return cached_response
         collab_info_url = f"{settings.HBP_COLLAB_SERVICE_URL_V2}collabs/{collab_id}"
-        headers = {'Authorization': request.META["HTTP_AUTHORIZATION"]}
+        headers = {'Authorization': auth}
         try:
-            res = requests.get(collab_info_url, headers=headers, timeout=5)
+            res = ebrains_session.get(collab_info_url, headers=headers, timeout=5)
         except requests.exceptions.ConnectionError as err:
             response = {
                 "error": {
@@ -70,6 +120,7 @@ class CollabService(object):
                 }
             else:
                 response = res.json()
+                collab_info_cache[cache_key] = response  # only cache successful lookups
         return response
 
     @classmethod
@@ -97,15 +148,7 @@ class IdentityService(object):
 
     @classmethod
     def get_user(cls, request):
-        url = f"{settings.HBP_IDENTITY_SERVICE_URL_V2}/userinfo"
-        headers = {'Authorization': request.META["HTTP_AUTHORIZATION"]}
-        logger.debug("Requesting EBRAINS user information for given access token")
-        res = requests.get(url, headers=headers)
-        if res.status_code != 200:
-            logger.debug("Error requesting {} with headers {}".format(url, headers))
-            raise Exception(res.content)
-        logger.debug("User information retrieved")
-        user_info = res.json()
+        user_info = get_userinfo(request)
         # make this compatible with the v1 json
         user_info["id"] = user_info["sub"]
         user_info["username"] = user_info.get("preferred_username", "unknown")
@@ -18,7 +18,7 @@ from django.conf.urls import url
 from django.core.mail import send_mail
 from django.http import HttpResponseForbidden, HttpResponseNotFound
 from django.contrib.auth.models import User
-from django.db.models import DurationField, F, ExpressionWrapper, Sum
+from django.db.models import Count, DurationField, F, ExpressionWrapper, Min, Sum
 from django.conf import settings
 
 from tastypie.resources import Resource, ModelResource, ALL
@@ -42,6 +42,11 @@ from quotas.models import Quota, Project
 CODE_MAX_LENGTH = 15000
 STANDARD_QUEUES = ("BrainScaleS", "BrainScaleS-ESS", "Spikey", "SpiNNaker", "BrainScaleS-2")
 
+# base queryset shared by the results resource and the statistics views;
+# querysets are lazy and filtering returns a clone, so this is built once
+# and refined per request
+COMPLETED_JOBS = Job.objects.filter(status__in=("finished", "error"))
+
 logger = logging.getLogger("simqueue")
 
 
@@ -87,8 +92,8 @@ class DataItemResource(ModelResource):
         ]
 
     def get_last(self, request, **kwargs):
-        obj = DataItem.objects.all().order_by('-id')[0:]
-        return super(DataItemResource, self).get_detail(request, id=obj[0].pk)
+        obj = DataItem.objects.order_by('-id').first()
+        return super(DataItemResource, self).get_detail(request, id=obj.pk)
 
 
 
@@ -120,6 +125,19 @@ class QuotaAbsentError(ErrorWithHttpResponse):
 class BaseJobResource(ModelResource):
     tags = fields.ListField()
 
+    def obj_get_list(self, bundle, **kwargs):
+        """
+        Leave out the potentially large JSON columns when listing jobs.
+
+        `hardware_config` and `provenance` are only serialized in detail
+        views (`use_in="detail"`), so there is no point pulling them over
+        the wire for every row in a listing.
+        """
+        object_list = super(BaseJobResource, self).obj_get_list(bundle, **kwargs)
+        if hasattr(object_list, "defer"):  # authorization may have returned a plain list
+            object_list = object_list.defer("hardware_config", "provenance")
+        return object_list
+
     def obj_delete(self, bundle, **kwargs):
         bundle.data['status'] = 'removed'
         return super(BaseJobResource, self).obj_update(bundle, **kwargs)
@@ -188,7 +206,9 @@ class QueueResource(BaseJobResource):
     provenance = fields.DictField(attribute="provenance", blank=True, null=True, use_in="detail")
 
     class Meta:
-        queryset = Job.objects.exclude(status__in=["removed", "error", "finished"]).order_by('-timestamp_submission')
+        # prefetch_related batches the per-job tag lookups into a single
+        # IN query, instead of one query per job when listing the queue
+        queryset = Job.objects.exclude(status__in=["removed", "error", "finished"]).prefetch_related("tags").order_by('-timestamp_submission')
         object_class = Job
         authentication = MultiAuthentication(ProviderAuthentication(), EBRAINSAuthentication())
         authorization = CollabAuthorization()
@@ -198,11 +218,11 @@ class QueueResource(BaseJobResource):
         detail_allowed_methods = ['get', 'put', 'patch', 'delete'] # you can retrieve and modify each item
         filtering = {
             'tags': ALL,
-            'status': ['exact'],
-            'id': ['exact'],
-            'collab_id': ['exact'],
-            'user_id': ['exact'],
-            'hardware_platform': ['exact']
+            'status': ['exact', 'in'],
+            'id': ['exact', 'in'],
+            'collab_id': ['exact', 'in'],
+            'user_id': ['exact', 'in'],
+            'hardware_platform': ['exact', 'in']
         }
         always_return_data = False
         #paginator_class = Paginator
@@ -290,19 +310,23 @@ class QueueResource(BaseJobResource):
                 raise QuotaAbsentError(msg)  # --> 403
 
     def _send_email(self, bundle):
-        users = User.objects.filter(social_auth__uid=bundle.data['user_id'])
+        # values_list skips ORM object construction: we only need two
+        # columns from the user and one from the (potentially large) log
+        users = list(User.objects.filter(social_auth__uid=bundle.data['user_id'])
+                                 .values_list("email", "username"))
 
         if len(users) > 0:
-            email = users[0].email
+            email, username = users[0]
             if len(users) > 1:
                 logger.warning("Multiple users found with the same oidc id.")
             if email:
                 logger.info("Sending e-mail about job #{} to {}".format(str(bundle.data['id']), email))
-                log_list = Log.objects.filter(pk=bundle.data['id'])
-                if log_list.count() == 0:
+                full_log_content = Log.objects.filter(pk=bundle.data['id']
+                                              ).values_list("content", flat=True).first()
+                if not full_log_content:
                     log_content = ""
                 else:
-                    log_lines = log_list[0].content.split("\n")
+                    log_lines = full_log_content.split("\n")
                     nb_lines = len(log_lines)
                     if nb_lines <= 100:
                         log_content = "\n".join(log_lines)
@@ -331,7 +355,7 @@ class QueueResource(BaseJobResource):
                 except Exception as err:
                     logger.error(err)
             else:
-                logger.info("E-mail not available for user {}".format(users[0].username))
+                logger.info("E-mail not available for user {}".format(username))
         else:
             logger.error("User matching job owner {} not found.".format(bundle.data['user_id']))
 
@@ -349,9 +373,10 @@ class QueueResource(BaseJobResource):
             logger.debug("Resources used: {}".format(resources_used))
             if resources_used is not None:
                 quota_id = bundle.data['hardware_config']['resource_allocation_id']
-                quota = Quota.objects.get(pk=quota_id)
-                quota.usage += resources_used/3600.0  # convert from seconds to hours
-                quota.save()
+                # single atomic UPDATE rather than fetch-then-save: one round-trip,
+                # and safe against concurrent jobs drawing on the same quota
+                Quota.objects.filter(pk=quota_id).update(
+                    usage=F('usage') + resources_used/3600.0)  # convert from seconds to hours
             logger.info("E-mail sent and quota updated")
         else:
             logger.info("Doing nothing for status {}".format(bundle.data['status']))
@@ -400,7 +425,10 @@ class ResultsResource(BaseJobResource):
     provenance = fields.DictField(attribute="provenance", blank=True, null=True, use_in="detail")
 
     class Meta:
-        queryset = Job.objects.filter(status__in=['finished', 'error']).order_by('-timestamp_submission')
+        # comments are serialized in full in list views, and each comment's
+        # `job` field needs the related Job to build its resource_uri, so we
+        # prefetch both to avoid two extra queries per job in the results list
+        queryset = COMPLETED_JOBS.prefetch_related("tags", "comments__job").order_by('-timestamp_submission')
         authentication = MultiAuthentication(ProviderAuthentication(), EBRAINSAuthentication())
         authorization = CollabAuthorization()
         serializer = ISO8601UTCOffsetSerializer(formats=['json'])
@@ -412,10 +440,10 @@ class ResultsResource(BaseJobResource):
         filtering = {
             'tags': ALL,
             'comments': ALL,
-            'status': ['exact'],
-            'id': ['exact'],
-            'collab_id': ['exact'],
-            'hardware_platform': ['exact']
+            'status': ['exact', 'in'],
+            'id': ['exact', 'in'],
+            'collab_id': ['exact', 'in'],
+            'hardware_platform': ['exact', 'in']
         }
 
     def dehydrate_code(self, bundle):
@@ -572,12 +600,11 @@ class JobCountResource(StatisticsResource):
         results = []
         counts = defaultdict(lambda: 0)
         for platform in STANDARD_QUEUES:
-            jobs = Job.objects.filter(status__in=('finished', 'error'),
-                                      hardware_platform=platform,
-                                      timestamp_completion__range=(period_start, period_end)
-                                     ).values('timestamp_completion')
-            completed = np.array([(job['timestamp_completion'] - period_start).days
-                                  for job in jobs])
+            jobs = COMPLETED_JOBS.filter(hardware_platform=platform,
+                                         timestamp_completion__range=(period_start, period_end)
+                                        ).values_list('timestamp_completion', flat=True)
+            completed = np.array([(timestamp - period_start).days
+                                  for timestamp in jobs])
             counts[platform], bin_edges = np.histogram(completed,
                                                        bins=np.arange(0, (period_end - period_start).days, interval))
 
@@ -623,12 +650,11 @@ class CumulativeJobCountResource(StatisticsResource):
         results = []
         counts = defaultdict(lambda: 0)
         for platform in STANDARD_QUEUES:
-            jobs = Job.objects.filter(status__in=('finished', 'error'),
-                                      hardware_platform=platform,
-                                      timestamp_completion__range=(period_start, period_end)
-                                     ).values('timestamp_completion')
-            completed = np.array([(job['timestamp_completion'] - period_start).days
-                                  for job in jobs])
+            jobs = COMPLETED_JOBS.filter(hardware_platform=platform,
+                                         timestamp_completion__range=(period_start, period_end)
+                                        ).values_list('timestamp_completion', flat=True)
+            completed = np.array([(timestamp - period_start).days
+                                  for timestamp in jobs])
             counts[platform], bin_edges = np.histogram(completed,
                                                        bins=np.arange(0, (period_end - period_start).days, interval))
 
@@ -656,16 +682,15 @@ class CumulativeUserCountResource(StatisticsResource):
         detail_allowed_methods = ['get']
 
     def obj_get(self, bundle, **kwargs):
-        users = Job.objects.values("user_id").distinct()
-        first_job_dates = []
         query = Job.objects
-        if  "platform" in bundle.request.GET:
+        if "platform" in bundle.request.GET:
             query = query.filter(hardware_platform=bundle.request.GET["platform"])
-        for n, user in enumerate(users):
-            user_id = user['user_id']
-            first_job = query.filter(user_id=user_id).first()
-            if first_job:
-                first_job_dates.append(first_job.timestamp_submission.date())
+        # one aggregate query for the first submission of every user,
+        # rather than one query per user
+        first_submissions = query.values("user_id"
+                                 ).annotate(first_submission=Min("timestamp_submission")
+                                 ).values_list("first_submission", flat=True)
+        first_job_dates = [timestamp.date() for timestamp in first_submissions]
         first_job_dates.append(date.today())
         user_counts = list(range(1, len(first_job_dates)))
         user_counts.append(user_counts[-1])  # repeat last value for today's date
@@ -732,14 +757,18 @@ class QueueLength(StatisticsResource):
         detail_allowed_methods = []
 
     def get_object_list(self, request):
-        queue_lengths = []
-        running_jobs = Job.objects.filter(status="running")
-        submitted_jobs = Job.objects.filter(status="submitted")
-        for queue_name in STANDARD_QUEUES:
-            r = running_jobs.filter(hardware_platform=queue_name).count()
-            s = submitted_jobs.filter(hardware_platform=queue_name).count()
-            queue_lengths.append(QueueStatus(queue_name, running=r, submitted=s))
-        return queue_lengths
+        # a single GROUP BY query, rather than two COUNT queries per queue
+        counts = Counter()
+        count_query = Job.objects.filter(status__in=("submitted", "running"),
+                                         hardware_platform__in=STANDARD_QUEUES
+                                        ).values("hardware_platform", "status"
+                                        ).annotate(n_jobs=Count("id"))
+        for row in count_query:
+            counts[(row["hardware_platform"], row["status"])] = row["n_jobs"]
+        return [QueueStatus(queue_name,
+                            running=counts[(queue_name, "running")],
+                            submitted=counts[(queue_name, "submitted")])
+                for queue_name in STANDARD_QUEUES]
 
 
 class JobDuration(StatisticsResource):
@@ -768,9 +797,9 @@ class JobDuration(StatisticsResource):
         job_durations = []
         for status in ("finished", "error"):
             for platform in STANDARD_QUEUES:
-                durations = [x['duration'].total_seconds()
-                             for x in all_jobs.filter(status=status, hardware_platform=platform).values('duration')
-                             if x['duration'] is not None]
+                durations = [duration.total_seconds()
+                             for duration in all_jobs.filter(status=status, hardware_platform=platform).values_list('duration', flat=True)
+                             if duration is not None]
                 durations = np.array(durations)
                 negative_durations = (durations < 0)
                 if negative_durations.any():
@@ -878,15 +907,14 @@ class QuotaUsageResource(StatisticsResource):
         counts = defaultdict(lambda: 0.0)
         n_bins = (period_end - period_start).days//interval + 1
         for platform in STANDARD_QUEUES:
-            jobs = Job.objects.filter(status__in=('finished', 'error'),
-                                      hardware_platform=platform,
-                                      timestamp_completion__range=(period_start, period_end)
-                                     ).values('timestamp_completion', 'resource_usage')
-            completed = np.array([(job['timestamp_completion'] - period_start).days
-                                  for job in jobs])
+            jobs = list(COMPLETED_JOBS.filter(hardware_platform=platform,
+                                              timestamp_completion__range=(period_start, period_end)
+                                             ).values_list('timestamp_completion', 'resource_usage'))
+            completed = np.array([(timestamp - period_start).days
+                                  for timestamp, usage in jobs])
             #counts[platform], bin_edges = np.histogram(completed,
             #                                           bins=np.arange(0, (period_end - period_start).days, interval))
-            resource_usage = np.array([job['resource_usage'] for job in jobs])
+            resource_usage = np.array([usage for timestamp, usage in jobs])
             index = completed//interval
             counts[platform] = np.zeros((n_bins,))
             for i, usage in zip(index, resource_usage):
@@ -1,6 +1,6 @@
 from datetime import datetime
+from django.contrib.postgres.fields import JSONField
 from django.db import models
-import jsonfield
 import pytz
 from taggit.managers import TaggableManager
 
@@ -32,10 +32,10 @@ class Job(models.Model):
     input_data = models.ManyToManyField('DataItem', related_name="input_to", blank=True)
     output_data = models.ManyToManyField('DataItem', related_name="generated_by", blank=True)
     hardware_platform = models.CharField(max_length=20)
-    hardware_config = jsonfield.JSONField(null=True, blank=True)
+    hardware_config = JSONField(null=True, blank=True)
     timestamp_submission = models.DateTimeField(default=now_in_utc, blank=True)
     timestamp_completion = models.DateTimeField(null=True, blank=True)
-    provenance = jsonfield.JSONField(null=True, blank=True)
+    provenance = JSONField(null=True, blank=True)
     resource_usage = models.FloatField(null=True, blank=True)
     tags = TaggableManager(blank=True)
 
@@ -66,6 +66,16 @@ class Job(models.Model):
     def __unicode__(self):
         return "Job #%d - %s" % (self.pk, str(self.collab_id))
 
+    class Meta:
+        # composite indexes backing the hot list queries:
+        # per-collab and per-user listings ordered by submission time,
+        # and the providers' "next submitted job for platform X" poll
+        index_together = [
+            ("collab_id", "status", "timestamp_submission"),
+            ("user_id", "timestamp_submission"),
+            ("hardware_platform", "status", "timestamp_submission"),
+        ]
+
 
 class Comment(models.Model):
     """
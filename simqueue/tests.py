@@ -252,6 +252,20 @@ class TestAPI_NoCollab_AsUser(TestCase):
         self.assertEqual(data2["meta"]["total_count"], len(submitted_SpiNNaker_jobs))
         self.assertEqual(set(job["hardware_platform"] for job in data2["objects"]), set(["SpiNNaker"]))  # maybe occasionally fail due to randomness in job generation
 
+    def test__queue_endpoint_filtered_status_in(self):
+        """The queue endpoint should accept a comma-separated list of statuses,
+        returning only the matching jobs, still scoped to the user."""
+        # "running" is a strict subset of the queue's population
+        # (submitted + running), so this fails if the filter is ignored
+        response = self.alice.get("/api/v2/queue?status__in=running")
+        data = response.json()
+        alices_running_jobs = [job for job in running_jobs if job["user_id"] == Alice]
+        self.assertEqual(data["meta"]["total_count"], len(alices_running_jobs))
+        self.assertEqual(set(job["status"] for job in data["objects"]),
+                         set(["running"]) if alices_running_jobs else set())
+        self.assertEqual(set(job["user_id"] for job in data["objects"]),
+                         set([Alice]) if alices_running_jobs else set())
+
     def test__queue_endpoint_get_individual_job(self):
         """In the absence of filtering by collab, a user should be able to access only jobs they submitted
         and/or jobs belonging to collabs to which they have access"""
@@ -3,6 +3,7 @@ from django.shortcuts import render
 from django.template.context import RequestContext
 from django.http import HttpResponse
 from django.contrib.auth.decorators import login_required
+from django.db import connection
 import json
 import requests
 import ebrains_drive
@@ -33,6 +34,14 @@ def get_file_size(file_path, unit):
         return convert_bytes(file_info.st_size, unit)
 
 
+def health(request):
+    """Check that the app is up and can reach the database."""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+        cursor.fetchone()
+    return HttpResponse(json.dumps({"status": "ok"}), content_type='application/json')
+
+
 def copy_datafiles_to_storage(request, target, job_id, path):
     # get list of output data files from job_id
     job = Job.objects.get(pk=job_id)